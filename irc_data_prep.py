@@ -35,9 +35,9 @@ Usage:
     result = quick_irc(df_clean.to_dict(orient="records"))
 """
 
-import math
 import warnings
 from datetime import datetime, date
+from functools import lru_cache
 from typing import Union, Optional
 
 try:
@@ -128,6 +128,10 @@ DEFAULTS = {
     "coupon_rate": 0.05,
 }
 
+# Low-cardinality label columns returned as pandas categoricals when
+# prepare_irc_data(..., categorical=True) is given a DataFrame
+_CATEGORICAL_COLUMNS = ("seniority", "sector", "region", "ccy")
+
 
 # =============================================================================
 # Known Sectors
@@ -161,6 +165,17 @@ KNOWN_SECTORS = {
 }
 
 
+def _warn_unknown_sectors(unknown_sectors, stacklevel: int = 2) -> None:
+    """Emit one warning listing every unrecognized sector found."""
+    if unknown_sectors:
+        warnings.warn(
+            f"Unrecognized sectors: {sorted(unknown_sectors)}. "
+            f"Known sectors: {sorted(KNOWN_SECTORS)}. "
+            f"These positions will use the default/region-based transition matrix.",
+            stacklevel=stacklevel + 1,
+        )
+
+
 # =============================================================================
 # Seniority Mapping
 # =============================================================================
@@ -175,24 +190,30 @@ SENIORITY_ALIASES = {
 }
 
 
+# Flat lowercase alias -> standard value lookup, built once at import
+_SENIORITY_LOOKUP = {
+    alias.lower(): standard
+    for standard, aliases in SENIORITY_ALIASES.items()
+    for alias in aliases
+}
+
+
 def _normalize_seniority(value: str) -> str:
     """Convert seniority aliases to standard values."""
     if value is None:
         return DEFAULTS["seniority"]
 
-    value_lower = str(value).strip().lower()
-
-    for standard, aliases in SENIORITY_ALIASES.items():
-        if value_lower in [a.lower() for a in aliases]:
-            return standard
-
-    return DEFAULTS["seniority"]
+    return _SENIORITY_LOOKUP.get(str(value).strip().lower(), DEFAULTS["seniority"])
 
 
 # =============================================================================
 # Boolean Conversion
 # =============================================================================
 
+_TRUE_STRINGS = frozenset({"true", "yes", "y", "1", "long", "buy"})
+_FALSE_STRINGS = frozenset({"false", "no", "n", "0", "short", "sell"})
+
+
 def _to_bool(value, default: bool = True) -> bool:
     """Convert various boolean representations to Python bool."""
     if value is None:
@@ -206,9 +227,9 @@ def _to_bool(value, default: bool = True) -> bool:
 
     value_str = str(value).strip().lower()
 
-    if value_str in ("true", "yes", "y", "1", "long", "buy"):
+    if value_str in _TRUE_STRINGS:
         return True
-    elif value_str in ("false", "no", "n", "0", "short", "sell"):
+    elif value_str in _FALSE_STRINGS:
         return False
 
     return default
@@ -232,37 +253,81 @@ DATE_FORMATS = [
 ]
 
 
+# DATE_FORMATS narrowed by separator, in the same priority order. A string
+# can only match formats whose separators it contains, so _parse_date_str()
+# tries just that bucket instead of failing through the whole list. The
+# space bucket keeps "%Y%m%d" because strptime's %d accepts " 5".
+_DATE_FORMAT_BUCKETS = {
+    "dash": tuple(fmt for fmt in DATE_FORMATS if "-" in fmt),
+    "slash": tuple(fmt for fmt in DATE_FORMATS if "/" in fmt),
+    "comma": tuple(fmt for fmt in DATE_FORMATS if "," in fmt),
+    "space": tuple(fmt for fmt in DATE_FORMATS if not any(c in fmt for c in "-/,")),
+    "compact": tuple(fmt for fmt in DATE_FORMATS if not any(c in fmt for c in "-/, ")),
+    "unknown": tuple(DATE_FORMATS),
+}
+
+# Strings that mean "no date"
+_NULL_DATE_STRINGS = frozenset({"nat", "nan", "none", ""})
+
+
+def _classify_date_str(value_str: str) -> str:
+    """Key into _DATE_FORMAT_BUCKETS for a stripped date string."""
+    if "-" in value_str:
+        return "dash"
+    if "/" in value_str:
+        return "slash"
+    if "," in value_str:
+        return "comma"
+    if " " in value_str:
+        return "space"
+    if value_str.isdigit():
+        return "compact"
+    return "unknown"  # e.g. tab-separated: try every format
+
+
 def _parse_date(value) -> Optional[date]:
     """Parse a date from various formats."""
     if value is None:
         return None
 
-    # Already a date/datetime
+    # Strings (the common case for raw files)
+    if isinstance(value, str):
+        return _parse_date_str(value.strip())
+
+    # Missing cells: NaN and NaT compare unequal to themselves
+    if isinstance(value, (float, datetime)) and value != value:
+        return None
+
+    # Already a date/datetime (including pandas Timestamp)
     if isinstance(value, datetime):
         return value.date()
     if isinstance(value, date):
         return value
 
-    # Handle pandas Timestamp
+    # Other objects with a date() method (e.g. numpy/pandas scalars)
     try:
         if hasattr(value, 'date'):
             return value.date()
-    except:
+    except Exception:
         pass
 
-    # Handle NaT or NaN
-    try:
-        if pd.isna(value):
-            return None
-    except:
-        pass
+    # Anything else (pd.NA, np.datetime64("NaT"), ...) via its string form
+    return _parse_date_str(str(value).strip())
 
-    # Parse string
-    value_str = str(value).strip()
-    if not value_str or value_str.lower() in ('nat', 'nan', 'none', ''):
+
+@lru_cache(maxsize=65536)
+def _parse_date_str(value_str: str) -> Optional[date]:
+    """
+    Parse a date string against DATE_FORMATS, first match wins.
+
+    Only the formats sharing the string's separator are tried. Cached per
+    distinct string: portfolios repeat the same as_of_date and maturity
+    strings, and a miss costs one strptime per candidate format.
+    """
+    if not value_str or value_str.lower() in _NULL_DATE_STRINGS:
         return None
 
-    for fmt in DATE_FORMATS:
+    for fmt in _DATE_FORMAT_BUCKETS[_classify_date_str(value_str)]:
         try:
             return datetime.strptime(value_str, fmt).date()
         except ValueError:
@@ -367,11 +432,22 @@ def _to_float(value, default: float = None) -> float:
     if value is None:
         return default
 
-    try:
-        if isinstance(value, float) and math.isnan(value):
-            return default
-    except (TypeError, ValueError):
-        pass
+    # Fast paths: plain floats/ints, and unformatted numeric strings
+    # (a failed float() costs more than the cleaning pass, so strings with
+    # separators or percentages skip the attempt)
+    value_type = type(value)
+    if value_type is float:
+        return default if value != value else value
+    if value_type is int:
+        return float(value)
+    if value_type is str and "," not in value and "%" not in value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+
+    if isinstance(value, float) and value != value:
+        return default
 
     if isinstance(value, (int, float)):
         return float(value)
@@ -404,16 +480,17 @@ def _normalize_column_name(col: str) -> str:
     return col.lower().strip().replace(" ", "_").replace("-", "_")
 
 
-def _find_standard_name(column: str) -> str:
-    """Find the standard IRC field name for a given column."""
-    col_normalized = _normalize_column_name(column)
+# Flat normalized alias -> standard field name lookup, built once at import
+_COLUMN_LOOKUP = {
+    _normalize_column_name(alias): standard_name
+    for standard_name, aliases in COLUMN_ALIASES.items()
+    for alias in aliases
+}
 
-    for standard_name, aliases in COLUMN_ALIASES.items():
-        for alias in aliases:
-            if _normalize_column_name(alias) == col_normalized:
-                return standard_name
 
-    return None
+def _find_standard_name(column: str) -> str:
+    """Find the standard IRC field name for a given column."""
+    return _COLUMN_LOOKUP.get(_normalize_column_name(column))
 
 
 def _build_column_mapping(columns: list) -> dict:
@@ -426,6 +503,249 @@ def _build_column_mapping(columns: list) -> dict:
     return mapping
 
 
+# =============================================================================
+# Column-wise Conversion (DataFrame input)
+# =============================================================================
+
+def _map_unique(values: "pd.Series", func) -> "pd.Series":
+    """
+    Apply a scalar converter once per distinct value of a column.
+
+    Missing cells (None/NaN/NaT) are passed to func as None.
+    """
+    codes, uniques = pd.factorize(values)
+    lookup = pd.Series([func(u) for u in uniques] + [func(None)]).to_numpy()
+    return pd.Series(lookup[codes], index=values.index)
+
+
+def _parse_date_column(values: "pd.Series") -> "pd.Series":
+    """
+    Column-wise _parse_date(): a date (or None) per cell.
+
+    datetime64 columns are converted directly. Text columns are parsed
+    once per distinct string, with one vectorized pd.to_datetime pass per
+    DATE_FORMATS entry in priority order; strings that no pass accepts
+    fall back to _parse_date_str().
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.date.astype(object).where(values.notna(), None)
+    if pd.api.types.infer_dtype(values, skipna=True) != "string":
+        return _map_unique(values, _parse_date)
+
+    codes, uniques = pd.factorize(values.str.strip())
+    dates = [None] * len(uniques)
+    pending = pd.Series(uniques)
+    for fmt in DATE_FORMATS:
+        if pending.empty:
+            break
+        parsed = pd.to_datetime(pending, format=fmt, errors="coerce", cache=True)
+        hit = parsed.notna()
+        for k, timestamp in parsed[hit].items():
+            dates[k] = timestamp.date()
+        pending = pending[~hit]
+    for k, value_str in pending.items():
+        dates[k] = _parse_date_str(value_str)
+
+    lookup = pd.Series(dates + [None], dtype=object).to_numpy()
+    return pd.Series(lookup[codes], index=values.index)
+
+
+def _to_float_column(values: "pd.Series") -> "pd.Series":
+    """
+    Column-wise _to_float(): floats, NaN where missing or unparseable.
+
+    Numeric columns are cast directly. Text has thousands separators and
+    spaces removed, and "%" values are divided by 100.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype(float)
+
+    text = (
+        values.astype(str)
+        .str.replace(",", "", regex=False)
+        .str.replace(" ", "", regex=False)
+        .str.strip()
+    )
+    percent = text.str.endswith("%")
+    numbers = pd.to_numeric(text.mask(percent, text.str[:-1]), errors="coerce").astype(float)
+    return numbers.mask(percent, numbers / 100)
+
+
+def _prepare_irc_dataframe(
+    data: "pd.DataFrame",
+    col_to_standard: dict,
+    validate: bool,
+    parsed_as_of: Optional[date],
+    reference_ccy: str,
+    fx_converter: FXRates,
+    categorical: bool = False,
+) -> tuple:
+    """
+    Column-wise prepare_irc_data() for DataFrame input.
+
+    Applies the same conversions, defaults and validation as the record
+    loop, a column at a time instead of cell by cell. Missing cells
+    (None/NaN/NaT) are treated like absent fields, so they take the
+    defaults instead of being converted as the strings "nan"/"None".
+    With ``categorical=True`` the seniority, sector, region and ccy
+    columns come back with ``category`` dtype.
+
+    Returns
+    -------
+    tuple
+        (clean DataFrame, list of validation error messages)
+    """
+    n_rows = len(data)
+    if n_rows == 0:
+        return pd.DataFrame(), []
+
+    index = pd.RangeIndex(n_rows)
+    row_labels = pd.Series(index.astype(str), index=index)
+    missing_column = pd.Series([None] * n_rows, index=index, dtype=object)
+
+    # Map column names (a later column mapped to the same field wins, as
+    # for record keys)
+    columns = {}
+    for orig in data.columns:
+        std_key = col_to_standard.get(orig, orig.lower().strip())
+        columns[std_key] = data[orig].reset_index(drop=True)
+
+    def column(name):
+        return columns.get(name, missing_column)
+
+    # First failing check per row, in the order of the record loop
+    row_error = pd.Series(None, index=index, dtype=object)
+
+    def flag(mask, message):
+        if validate:
+            row_error[mask & row_error.isna()] = message
+
+    # === Required: Issuer ===
+    issuer = column("issuer")
+    issuer_text = issuer.astype(str).str.strip()
+    issuer_missing = issuer.isna() | (issuer_text == "")
+    flag(issuer_missing, "missing issuer")
+    columns["issuer"] = issuer_text.mask(issuer_missing, "unknown_" + row_labels)
+
+    # === Required: Notional (with optional currency conversion) ===
+    notional = _to_float_column(column("notional"))
+    flag(notional.isna(), "missing or invalid notional")
+    notional = notional.fillna(0.0)
+
+    # Currency conversion once per currency, on all its rows at a time.
+    # The notional array goes through FXRates.convert itself rather than a
+    # precomputed convert(1.0, ...) multiplier: triangulated pairs compute
+    # amount * r1 * r2, which a single combined rate would not round the
+    # same way as the record path
+    if reference_ccy and fx_converter:
+        ccy = column("ccy")
+        ccy_text = ccy.astype(str).str.strip().str.upper()
+        from_ccy = ccy_text.mask(ccy.isna() | (ccy_text == ""), reference_ccy.upper())
+        converted = notional != 0
+        # A portfolio already in the reference currency is a single group
+        # that _convert_to_reference_ccy returns unchanged, without FX lookups
+        for code in from_ccy[converted].unique():
+            rows = converted & (from_ccy == code)
+            try:
+                notional[rows] = _convert_to_reference_ccy(
+                    notional[rows].to_numpy(),
+                    from_ccy=code,
+                    reference_ccy=reference_ccy,
+                    fx_converter=fx_converter,
+                )
+            except ValueError as e:
+                flag(rows, str(e))
+                converted &= ~rows
+        if converted.any():
+            columns["original_ccy"] = ccy.where(converted)
+            columns["ccy"] = ccy.mask(converted, reference_ccy)
+
+    columns["notional"] = notional
+
+    # === Required: Tenor (from tenor_years OR calculated from maturity_date) ===
+    tenor = _to_float_column(column("tenor_years"))
+
+    # If no tenor but we have maturity_date and as_of_date, calculate TTM
+    if parsed_as_of is not None and "maturity_date" in columns:
+        maturity = columns["maturity_date"]
+        pending = tenor.isna() & maturity.notna()
+        parsed_maturity = _parse_date_column(maturity[pending])
+        dated = parsed_maturity[parsed_maturity.notna()]
+        if len(dated):
+            tenor[dated.index] = _map_unique(dated, lambda d: _calculate_ttm(parsed_as_of, d))
+            if pd.api.types.is_datetime64_any_dtype(maturity):
+                maturity = maturity.astype(object)  # holds the ISO strings below
+            columns["maturity_date"] = maturity.mask(
+                tenor.index.isin(dated.index), _map_unique(dated, lambda d: d and d.isoformat())
+            )
+            columns["as_of_date"] = pd.Series(parsed_as_of.isoformat(), index=index).where(
+                tenor.index.isin(dated.index)
+            )
+
+    flag(tenor.isna(), "missing tenor_years (and no maturity_date/as_of_date to calculate)")
+    columns["tenor_years"] = tenor.mask(tenor.isna() | (tenor == 0), 1.0)
+
+    # === Rating (from rating or pd) ===
+    raw_rating = column("rating")
+    raw_pd = _to_float_column(column("pd"))
+
+    # Handle PD as percentage (>1 means it was given as percent, e.g., 5 instead of 0.05)
+    raw_pd = raw_pd.mask(raw_pd > 1, raw_pd / 100)
+
+    flag(raw_rating.isna() & raw_pd.isna(), "missing both rating and pd")
+
+    # Resolve to base rating, once per distinct rating string or PD
+    has_rating = raw_rating.notna() & (raw_rating.astype(str) != "")
+    from_pd = ~has_rating & raw_pd.notna()
+    rating = pd.Series(resolve_rating(), index=index, dtype=object)
+    rating[has_rating] = _map_unique(raw_rating[has_rating].astype(str), lambda r: resolve_rating(rating=r))
+    rating[from_pd] = _map_unique(raw_pd[from_pd], lambda p: resolve_rating(pd=p))
+    columns["rating"] = rating
+
+    # Store original PD if provided (useful for reporting)
+    if "pd" in columns:
+        columns["pd"] = raw_pd.where(raw_pd.notna(), columns["pd"])
+
+    # === Optional fields with defaults ===
+    columns["market_value"] = _to_float_column(column("market_value")).fillna(notional)
+    columns["seniority"] = (
+        column("seniority").astype(str).str.strip().str.lower()
+        .map(_SENIORITY_LOOKUP).fillna(DEFAULTS["seniority"])
+    )
+    lgd = _to_float_column(column("lgd"))  # None = derive from seniority
+    # Missing cells as None rather than NaN, like absent fields in the
+    # record loop (quick_irc rejects an LGD of NaN)
+    columns["lgd"] = lgd.astype(object).where(lgd.notna(), None) if lgd.notna().any() else missing_column
+
+    raw_sector = column("sector")
+    sector = raw_sector.astype(str).str.strip().str.lower().mask(raw_sector.isna(), DEFAULTS["sector"])
+    unknown_sector = ~sector.isin(KNOWN_SECTORS) & row_error.isna()
+    _warn_unknown_sectors(set(sector[unknown_sector]), stacklevel=3)
+    columns["sector"] = sector
+
+    region = column("region")
+    columns["region"] = region.astype(str).str.strip().str.upper().mask(region.isna(), DEFAULTS["region"])
+    columns["is_long"] = _map_unique(column("is_long"), lambda v: _to_bool(v, DEFAULTS["is_long"]))
+    columns["liquidity_horizon_months"] = (
+        _to_float_column(column("liquidity_horizon_months"))
+        .fillna(DEFAULTS["liquidity_horizon_months"])
+        .astype(int)
+    )
+    columns["coupon_rate"] = _to_float_column(column("coupon_rate")).fillna(DEFAULTS["coupon_rate"])
+    position_id = column("position_id")
+    columns["position_id"] = position_id.astype(str).str.strip().mask(position_id.isna(), "pos_" + row_labels)
+
+    # Low-cardinality labels as categoricals (opt-in): one small integer
+    # code per cell instead of a Python str object
+    if categorical:
+        for col in _CATEGORICAL_COLUMNS:
+            if col in columns:
+                columns[col] = columns[col].astype("category")
+
+    errors = [f"Row {i}: {message}" for i, message in row_error.dropna().items()]
+    return pd.DataFrame(columns), errors
+
+
 # =============================================================================
 # Main Preparation Function
 # =============================================================================
@@ -437,6 +757,7 @@ def prepare_irc_data(
     as_of_date: Union[str, date, datetime] = None,
     reference_ccy: str = None,
     fx_rates: dict = None,
+    categorical: bool = False,
 ) -> Union[list, "pd.DataFrame"]:
     """
     Prepare raw data for IRC calculation.
@@ -471,10 +792,19 @@ def prepare_irc_data(
         - FXRates object: from fx.py module with market convention handling
         If not provided, uses defaults.
 
+    categorical : bool
+        DataFrame input only: return the seniority, sector, region and ccy
+        columns with pandas ``category`` dtype (less memory on large
+        portfolios). Off by default, since categoricals reject values
+        outside their categories on assignment and change groupby/concat
+        behaviour. Ignored for list input.
+
     Returns
     -------
     list[dict] or pd.DataFrame
-        Clean data ready for quick_irc().
+        Clean data ready for quick_irc(), in the same container as the
+        input. A DataFrame is prepared column by column into a new frame
+        (the input is not modified) without going through per-row dicts.
 
     Required Fields (at least one of rating/pd, and tenor_years OR maturity_date):
     ------------------------------------------------------------------------------
@@ -512,11 +842,10 @@ def prepare_irc_data(
     ... )
     >>> result = quick_irc(clean.to_dict(orient="records"))
     """
-    # Convert DataFrame to list of dicts for uniform processing
+    # DataFrames are converted column by column, lists of dicts record by record
     is_dataframe = HAS_PANDAS and isinstance(data, pd.DataFrame)
 
     if is_dataframe:
-        records = data.to_dict(orient="records")
         available_columns = list(data.columns)
     else:
         records = list(data)
@@ -532,6 +861,39 @@ def prepare_irc_data(
     if reference_ccy:
         fx_converter = _get_fx_converter(fx_rates, reference_ccy)
 
+    # Reference date for TTM, parsed once
+    parsed_as_of = _parse_date(as_of_date) if as_of_date is not None else None
+
+    if is_dataframe:
+        clean_df, errors = _prepare_irc_dataframe(
+            data, col_to_standard, validate, parsed_as_of, reference_ccy, fx_converter,
+            categorical,
+        )
+        if errors:
+            raise ValueError("Data validation errors:\n" + "\n".join(errors))
+        return clean_df
+
+    # Loop invariants bound once (standard key per original key, filled on
+    # first sight; defaults and converters as locals). Column renaming is
+    # thus resolved once per schema, leaving only the per-field conversions
+    # in the loop body.
+    key_map = {}
+    to_float = _to_float
+    to_bool = _to_bool
+    normalize_seniority = _normalize_seniority
+    known_sectors = KNOWN_SECTORS
+    default_sector = DEFAULTS["sector"]
+    default_region = DEFAULTS["region"]
+    default_is_long = DEFAULTS["is_long"]
+    default_lh_months = DEFAULTS["liquidity_horizon_months"]
+    default_coupon = DEFAULTS["coupon_rate"]
+    as_of_iso = parsed_as_of.isoformat() if parsed_as_of is not None else None
+    unknown_sectors = set()
+
+    # Base rating per distinct (rating string, PD) pair: portfolios hold many
+    # positions per issuer, so each pair is resolved only once
+    resolved_ratings = {}
+
     # Process each record
     clean_records = []
     errors = []
@@ -539,9 +901,16 @@ def prepare_irc_data(
     for i, record in enumerate(records):
         clean = {}
 
-        # Map column names
+        # Map column names. Missing cells (None/NaN, e.g. from
+        # df.to_dict("records")) are dropped so they take the defaults,
+        # as in the DataFrame path, instead of becoming "nan"/"None"
         for orig_key, value in record.items():
-            std_key = col_to_standard.get(orig_key, orig_key.lower().strip())
+            std_key = key_map.get(orig_key)
+            if std_key is None:
+                std_key = key_map[orig_key] = col_to_standard.get(orig_key, orig_key.lower().strip())
+            if value is None or (isinstance(value, float) and value != value):
+                clean.pop(std_key, None)
+                continue
             clean[std_key] = value
 
         # === Required: Issuer ===
@@ -552,7 +921,7 @@ def prepare_irc_data(
         clean["issuer"] = str(issuer).strip() if issuer else f"unknown_{i}"
 
         # === Required: Notional (with optional currency conversion) ===
-        notional = _to_float(clean.get("notional"))
+        notional = to_float(clean.get("notional"))
         if notional is None and validate:
             errors.append(f"Row {i}: missing or invalid notional")
             continue
@@ -578,19 +947,18 @@ def prepare_irc_data(
         clean["notional"] = notional
 
         # === Required: Tenor (from tenor_years OR calculated from maturity_date) ===
-        tenor = _to_float(clean.get("tenor_years"))
+        tenor = to_float(clean.get("tenor_years"))
 
         # If no tenor but we have maturity_date and as_of_date, calculate TTM
-        if tenor is None and as_of_date is not None:
+        if tenor is None and parsed_as_of is not None:
             maturity_date_raw = clean.get("maturity_date")
             if maturity_date_raw is not None:
-                parsed_as_of = _parse_date(as_of_date)
                 parsed_maturity = _parse_date(maturity_date_raw)
 
-                if parsed_as_of and parsed_maturity:
+                if parsed_maturity:
                     tenor = _calculate_ttm(parsed_as_of, parsed_maturity)
                     clean["maturity_date"] = parsed_maturity.isoformat()
-                    clean["as_of_date"] = parsed_as_of.isoformat()
+                    clean["as_of_date"] = as_of_iso
 
         if tenor is None and validate:
             errors.append(f"Row {i}: missing tenor_years (and no maturity_date/as_of_date to calculate)")
@@ -600,7 +968,7 @@ def prepare_irc_data(
 
         # === Rating (from rating or pd) ===
         raw_rating = clean.get("rating")
-        raw_pd = _to_float(clean.get("pd"))
+        raw_pd = to_float(clean.get("pd"))
 
         # Handle PD as percentage (>1 means it was given as percent, e.g., 5 instead of 0.05)
         if raw_pd is not None and raw_pd > 1:
@@ -611,45 +979,40 @@ def prepare_irc_data(
             continue
 
         # Resolve to base rating
-        clean["rating"] = resolve_rating(
-            rating=str(raw_rating) if raw_rating else None,
-            pd=raw_pd,
-        )
+        rating_key = (str(raw_rating) if raw_rating else None, raw_pd)
+        rating = resolved_ratings.get(rating_key)
+        if rating is None:
+            rating = resolved_ratings[rating_key] = resolve_rating(rating=rating_key[0], pd=raw_pd)
+        clean["rating"] = rating
 
         # Store original PD if provided (useful for reporting)
         if raw_pd is not None:
             clean["pd"] = raw_pd
 
         # === Optional fields with defaults ===
-        clean["market_value"] = _to_float(clean.get("market_value"), clean["notional"])
-        clean["seniority"] = _normalize_seniority(clean.get("seniority"))
-        clean["lgd"] = _to_float(clean.get("lgd"))  # None = derive from seniority
-        sector = str(clean.get("sector", DEFAULTS["sector"])).strip().lower()
-        if sector not in KNOWN_SECTORS:
-            warnings.warn(
-                f"Row {i} (issuer={clean['issuer']}): unrecognized sector '{sector}'. "
-                f"Known sectors: {sorted(KNOWN_SECTORS)}. "
-                f"Position will use default/region-based transition matrix.",
-                stacklevel=2,
-            )
+        clean["market_value"] = to_float(clean.get("market_value"), notional)
+        clean["seniority"] = normalize_seniority(clean.get("seniority"))
+        clean["lgd"] = to_float(clean.get("lgd"))  # None = derive from seniority
+        sector = str(clean.get("sector", default_sector)).strip().lower()
+        if sector not in known_sectors:
+            unknown_sectors.add(sector)
         clean["sector"] = sector
-        clean["region"] = str(clean.get("region", DEFAULTS["region"])).strip().upper()
-        clean["is_long"] = _to_bool(clean.get("is_long"), DEFAULTS["is_long"])
-        clean["liquidity_horizon_months"] = int(_to_float(
-            clean.get("liquidity_horizon_months"), DEFAULTS["liquidity_horizon_months"]
+        clean["region"] = str(clean.get("region", default_region)).strip().upper()
+        clean["is_long"] = to_bool(clean.get("is_long"), default_is_long)
+        clean["liquidity_horizon_months"] = int(to_float(
+            clean.get("liquidity_horizon_months"), default_lh_months
         ))
-        clean["coupon_rate"] = _to_float(clean.get("coupon_rate"), DEFAULTS["coupon_rate"])
-        clean["position_id"] = str(clean.get("position_id", f"pos_{i}")).strip()
+        clean["coupon_rate"] = to_float(clean.get("coupon_rate"), default_coupon)
+        clean["position_id"] = str(clean["position_id"]).strip() if "position_id" in clean else f"pos_{i}"
 
         clean_records.append(clean)
 
+    _warn_unknown_sectors(unknown_sectors)
+
     # Report errors
     if errors and validate:
         raise ValueError(f"Data validation errors:\n" + "\n".join(errors))
 
-    # Return in same format as input
-    if is_dataframe:
-        return pd.DataFrame(clean_records)
     return clean_records
 
 
@@ -670,18 +1033,23 @@ def validate_irc_data(data: Union[list, "pd.DataFrame"]) -> dict:
     errors = []
     warnings = []
 
-    if HAS_PANDAS and isinstance(data, pd.DataFrame):
-        records = data.to_dict(orient="records")
+    # DataFrames are checked from their columns, without per-row dicts
+    is_dataframe = HAS_PANDAS and isinstance(data, pd.DataFrame)
+    if is_dataframe:
+        records = None
+        num_records = len(data)
+        columns = list(data.columns)
     else:
         records = list(data)
+        num_records = len(records)
+        columns = list(records[0].keys()) if records else []
 
-    if not records:
+    if not num_records:
         errors.append("No data provided")
         return {"valid": False, "errors": errors, "warnings": warnings, "summary": {}}
 
     # Check for required columns using the mapping
-    sample = records[0]
-    col_mapping = _build_column_mapping(list(sample.keys()))
+    col_mapping = _build_column_mapping(columns)
     mapped_fields = set(col_mapping.values())
 
     has_issuer = "issuer" in mapped_fields
@@ -707,13 +1075,17 @@ def validate_irc_data(data: Union[list, "pd.DataFrame"]) -> dict:
             break
 
     if sector_col:
-        unrecognized = set()
-        for rec in records:
-            val = rec.get(sector_col)
-            if val is not None:
-                sector_lower = str(val).strip().lower()
-                if sector_lower and sector_lower not in KNOWN_SECTORS:
-                    unrecognized.add(sector_lower)
+        if is_dataframe:
+            # Normalize the distinct raw values only, not every row
+            raw_sectors = pd.Series(data[sector_col].dropna().unique())
+            sectors = set(raw_sectors.astype(str).str.strip().str.lower())
+        else:
+            sectors = {
+                str(val).strip().lower()
+                for val in (rec.get(sector_col) for rec in records)
+                if val is not None
+            }
+        unrecognized = {s for s in sectors if s and s not in KNOWN_SECTORS}
         if unrecognized:
             warnings.append(
                 f"Unrecognized sectors: {sorted(unrecognized)}. "
@@ -722,8 +1094,8 @@ def validate_irc_data(data: Union[list, "pd.DataFrame"]) -> dict:
 
     # Summary
     summary = {
-        "num_records": len(records),
-        "columns_found": list(sample.keys()),
+        "num_records": num_records,
+        "columns_found": columns,
     }
 
     return {
@@ -738,7 +1110,7 @@ def validate_irc_data(data: Union[list, "pd.DataFrame"]) -> dict:
 # Convenience Function
 # =============================================================================
 
-def load_and_prepare(filepath: str, **kwargs) -> "pd.DataFrame":
+def load_and_prepare(filepath: str, *, read_csv_kwargs: dict = None, **kwargs) -> "pd.DataFrame":
     """
     Load CSV and prepare for IRC in one step.
 
@@ -746,6 +1118,13 @@ def load_and_prepare(filepath: str, **kwargs) -> "pd.DataFrame":
     ----------
     filepath : str
         Path to CSV file.
+    read_csv_kwargs : dict, optional
+        Passed to pd.read_csv(), e.g. {"thousands": ",", "dtype": {...},
+        "parse_dates": [...]}. Columns that arrive typed (numeric, or
+        datetime64 maturities) skip the string cleaning and date format
+        trials in prepare_irc_data(). Dates are not parsed by default:
+        pandas infers one format per column and reads "01/02/2024"
+        month-first, whereas prepare_irc_data() tries day-first first.
     **kwargs
         Passed to prepare_irc_data().
 
@@ -757,5 +1136,5 @@ def load_and_prepare(filepath: str, **kwargs) -> "pd.DataFrame":
     if not HAS_PANDAS:
         raise ImportError("pandas required for load_and_prepare()")
 
-    df = pd.read_csv(filepath)
+    df = pd.read_csv(filepath, **(read_csv_kwargs or {}))
     return prepare_irc_data(df, **kwargs)
@@ -12,6 +12,18 @@ Reference: SRP31 (Interest Rate Risk in Banking Book)
 import math
 from typing import Optional
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
 
 # =============================================================================
 # IRRBB Shock Scenarios (SRP31.90)
@@ -124,6 +136,22 @@ def calculate_pv01(
     return notional * duration * 0.0001
 
 
+def _sum_positions(positions: list[dict]) -> tuple:
+    """
+    Aggregate positions in one pass.
+
+    Returns (total notional, sum of notional × duration, total PV01).
+    """
+    total = weighted = pv01 = 0
+    for position in positions:
+        notional = position["notional"]
+        notional_duration = notional * position["duration"]
+        total += notional
+        weighted += notional_duration
+        pv01 += notional_duration * 0.0001  # calculate_pv01, inlined
+    return total, weighted, pv01
+
+
 def calculate_duration_gap(
     assets: list[dict],
     liabilities: list[dict]
@@ -143,20 +171,19 @@ def calculate_duration_gap(
     dict
         Duration gap analysis
     """
-    total_assets = sum(a["notional"] for a in assets)
-    total_liabilities = sum(l["notional"] for l in liabilities)
+    # Totals, notional-weighted durations and PV01, one pass per side
+    total_assets, weighted_assets, pv01_assets = _sum_positions(assets)
+    total_liabilities, weighted_liabilities, pv01_liabilities = _sum_positions(liabilities)
 
     # Weighted average duration
-    wa_duration_assets = sum(a["notional"] * a["duration"] for a in assets) / total_assets if total_assets > 0 else 0
-    wa_duration_liabilities = sum(l["notional"] * l["duration"] for l in liabilities) / total_liabilities if total_liabilities > 0 else 0
+    wa_duration_assets = weighted_assets / total_assets if total_assets > 0 else 0
+    wa_duration_liabilities = weighted_liabilities / total_liabilities if total_liabilities > 0 else 0
 
     # Duration gap
     leverage = total_assets / (total_assets - total_liabilities) if total_assets != total_liabilities else 1
     duration_gap = wa_duration_assets - (total_liabilities / total_assets) * wa_duration_liabilities if total_assets > 0 else 0
 
     # PV01
-    pv01_assets = sum(calculate_pv01(a["notional"], a["duration"]) for a in assets)
-    pv01_liabilities = sum(calculate_pv01(l["notional"], l["duration"]) for l in liabilities)
     net_pv01 = pv01_assets - pv01_liabilities
 
     return {
@@ -247,8 +274,11 @@ def calculate_eve_all_scenarios(
     results = {"gap_analysis": gap_analysis, "scenarios": {}}
 
     # Parallel shocks
-    for scenario in ["parallel_up", "parallel_down"]:
-        shock = IRRBB_SHOCK_SCENARIOS[scenario].get(currency, IRRBB_SHOCK_SCENARIOS[scenario]["other"])
+    # Shocks are read from IRRBB_SHOCK_SCENARIOS on each call (not a table
+    # built at import), so recalibrating the module dict takes effect
+    for scenario in ("parallel_up", "parallel_down"):
+        shocks_by_ccy = IRRBB_SHOCK_SCENARIOS[scenario]
+        shock = shocks_by_ccy.get(currency, shocks_by_ccy["other"])
         impact = calculate_eve_impact(gap_analysis, shock)
         results["scenarios"][scenario] = impact
 
@@ -272,6 +302,10 @@ def calculate_repricing_gap(
     """
     Calculate repricing gap by time bucket.
 
+    The result depends only on the portfolio, so shock sweeps should build
+    it once and pass it to calculate_nii_sensitivity() or
+    calculate_nii_sensitivity_batch() for every scenario.
+
     Parameters:
     -----------
     assets_by_bucket : dict
@@ -303,6 +337,57 @@ def calculate_repricing_gap(
     return gaps
 
 
+def calculate_repricing_gap_df(
+    df: "pd.DataFrame",
+    bucket_col: str = "bucket",
+    side_col: str = "side",
+    amount_col: str = "amount"
+) -> dict:
+    """
+    Calculate repricing gap from balance-sheet line items in a DataFrame.
+
+    Line items are summed per (side, bucket) in one groupby, then passed
+    to calculate_repricing_gap(), so the result has the same structure.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        One row per line item
+    bucket_col : str
+        Column with the TIME_BUCKETS bucket name
+    side_col : str
+        Column with "asset" or "liability"
+    amount_col : str
+        Column with the repricing amount
+
+    Returns:
+    --------
+    dict
+        Repricing gap analysis (see calculate_repricing_gap)
+    """
+    if not HAS_PANDAS:
+        raise ImportError("pandas required for calculate_repricing_gap_df()")
+
+    totals = df.groupby([side_col, bucket_col], observed=True)[amount_col].sum()
+    by_side = {side: group.droplevel(0).to_dict() for side, group in totals.groupby(level=0)}
+
+    unknown_sides = set(by_side) - {"asset", "liability"}
+    if unknown_sides:
+        raise ValueError(
+            f"Unknown {side_col} values: {sorted(map(str, unknown_sides))}. "
+            f"Expected 'asset' or 'liability'"
+        )
+
+    return calculate_repricing_gap(by_side.get("asset", {}), by_side.get("liability", {}))
+
+
+def _nii_time_weight(bucket: str, time_horizon_years: float) -> float:
+    """Time a bucket's repricing gap stays within the NII horizon."""
+    # Get midpoint of bucket for time remaining calculation
+    duration = BUCKET_DURATIONS.get(bucket, 0.5)
+    return max(0, min(time_horizon_years - duration/2, time_horizon_years))
+
+
 def calculate_nii_sensitivity(
     repricing_gaps: dict,
     rate_shock_bps: int = 200,
@@ -333,11 +418,9 @@ def calculate_nii_sensitivity(
     bucket_impacts = {}
 
     for bucket, data in repricing_gaps.items():
-        # Get midpoint of bucket for time remaining calculation
-        duration = BUCKET_DURATIONS.get(bucket, 0.5)
-
-        # Time remaining in horizon
-        time_in_horizon = max(0, min(time_horizon_years - duration/2, time_horizon_years))
+        # Time remaining in horizon (read from BUCKET_DURATIONS on every
+        # call, so recalibrated durations take effect immediately)
+        time_in_horizon = _nii_time_weight(bucket, time_horizon_years)
 
         # NII impact for this bucket
         nii_impact = data["gap"] * rate_shock * time_in_horizon
@@ -358,6 +441,45 @@ def calculate_nii_sensitivity(
     }
 
 
+def calculate_nii_sensitivity_batch(
+    repricing_gaps: dict,
+    rate_shocks_bps,
+    time_horizon_years: float = 1.0
+) -> "np.ndarray":
+    """
+    Total NII impact for many rate shocks on the same repricing gaps.
+
+    Equivalent to calculate_nii_sensitivity(...)["total_nii_impact"] for
+    each shock, computed one bucket at a time across all shocks at once
+    (for scenario sweeps and Monte Carlo over rate shocks).
+
+    Parameters:
+    -----------
+    repricing_gaps : dict
+        Output from calculate_repricing_gap
+    rate_shocks_bps : array-like
+        Interest rate shocks in basis points, one per scenario
+    time_horizon_years : float
+        NII calculation horizon (typically 1 year)
+
+    Returns:
+    --------
+    np.ndarray
+        Total NII impact per shock, same shape as rate_shocks_bps
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy required for batch NII sensitivity: pip install numpy")
+
+    rate_shocks = np.asarray(rate_shocks_bps, dtype=np.float64) / 10000
+
+    total_nii_impact = np.zeros_like(rate_shocks)
+    for bucket, data in repricing_gaps.items():
+        time_in_horizon = _nii_time_weight(bucket, time_horizon_years)
+        total_nii_impact += data["gap"] * rate_shocks * time_in_horizon
+
+    return total_nii_impact
+
+
 # =============================================================================
 # Comprehensive IRRBB Analysis
 # =============================================================================
@@ -514,30 +636,35 @@ if __name__ == "__main__":
         tier1_capital, "USD"
     )
 
+    eve = result['eve']
+    gap_analysis = eve['gap_analysis']
+    nii = result['nii']
+    capital = result['capital']
+
     # Print EVE results
     print("\n  EVE Analysis:")
-    print(f"    Total Assets:          ${result['eve']['gap_analysis']['total_assets']:,.0f}")
-    print(f"    Total Liabilities:     ${result['eve']['gap_analysis']['total_liabilities']:,.0f}")
-    print(f"    Equity:                ${result['eve']['gap_analysis']['equity']:,.0f}")
-    print(f"    Duration Gap:          {result['eve']['gap_analysis']['duration_gap']:.2f} years")
-    print(f"    Net PV01:              ${result['eve']['gap_analysis']['net_pv01']:,.0f}")
+    print(f"    Total Assets:          ${gap_analysis['total_assets']:,.0f}")
+    print(f"    Total Liabilities:     ${gap_analysis['total_liabilities']:,.0f}")
+    print(f"    Equity:                ${gap_analysis['equity']:,.0f}")
+    print(f"    Duration Gap:          {gap_analysis['duration_gap']:.2f} years")
+    print(f"    Net PV01:              ${gap_analysis['net_pv01']:,.0f}")
 
     print("\n  EVE Scenarios:")
-    for scenario, impact in result['eve']['scenarios'].items():
+    for scenario, impact in eve['scenarios'].items():
         print(f"    {scenario:<15}: ΔEVE = ${impact['eve_change']:,.0f} ({impact['eve_change_pct']:.1f}%)")
 
-    print(f"\n    Worst scenario:        {result['eve']['worst_scenario']}")
-    print(f"    Worst ΔEVE:            ${result['eve']['worst_eve_change']:,.0f} ({result['eve']['worst_eve_change_pct']:.1f}%)")
+    print(f"\n    Worst scenario:        {eve['worst_scenario']}")
+    print(f"    Worst ΔEVE:            ${eve['worst_eve_change']:,.0f} ({eve['worst_eve_change_pct']:.1f}%)")
 
     # Print NII results
     print("\n  NII Analysis (1-year horizon):")
-    print(f"    +200bps impact:        ${result['nii']['parallel_up']['total_nii_impact']:,.0f}")
-    print(f"    -200bps impact:        ${result['nii']['parallel_down']['total_nii_impact']:,.0f}")
+    print(f"    +200bps impact:        ${nii['parallel_up']['total_nii_impact']:,.0f}")
+    print(f"    -200bps impact:        ${nii['parallel_down']['total_nii_impact']:,.0f}")
 
     # Print capital results
     print("\n  Capital Analysis:")
-    print(f"    Tier 1 Capital:        ${result['capital']['tier1_capital']:,.0f}")
-    print(f"    EVE Loss:              ${result['capital']['eve_loss']:,.0f} ({result['capital']['eve_loss_pct']:.1f}% of T1)")
-    print(f"    Outlier (>15%):        {result['capital']['is_outlier']}")
-    if result['capital']['pillar2_addon'] > 0:
-        print(f"    Suggested P2 add-on:   ${result['capital']['pillar2_addon']:,.0f}")
+    print(f"    Tier 1 Capital:        ${capital['tier1_capital']:,.0f}")
+    print(f"    EVE Loss:              ${capital['eve_loss']:,.0f} ({capital['eve_loss_pct']:.1f}% of T1)")
+    print(f"    Outlier (>15%):        {capital['is_outlier']}")
+    if capital['pillar2_addon'] > 0:
+        print(f"    Suggested P2 add-on:   ${capital['pillar2_addon']:,.0f}")
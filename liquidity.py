@@ -10,6 +10,12 @@ Reference: LCR (LIQ30), NSFR (LIQ40)
 
 from typing import Optional
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 # =============================================================================
 # LCR - Liquidity Coverage Ratio (LIQ30)
@@ -33,6 +39,19 @@ HQLA_HAIRCUTS = {
     "L2B_equity_major_index": 0.50,
 }
 
+
+def _hqla_level(asset_type: str) -> str:
+    """HQLA level of an asset type, from its L1/L2A prefix (else L2B)."""
+    if asset_type.startswith("L1"):
+        return "L1"
+    if asset_type.startswith("L2A"):
+        return "L2A"
+    return "L2B"
+
+
+# HQLA level of each known asset type, resolved once at import
+HQLA_LEVELS = {asset_type: _hqla_level(asset_type) for asset_type in HQLA_HAIRCUTS}
+
 # Cash outflow rates (LIQ30.52-76)
 CASH_OUTFLOW_RATES = {
     # Retail deposits
@@ -75,7 +94,13 @@ CASH_INFLOW_RATES = {
 }
 
 
-def calculate_hqla(assets: list[dict]) -> dict:
+# The per-item loops in this module stay in plain Python: inputs are lists
+# of dicts, and gathering them into NumPy arrays costs more than the loop
+# itself, so array (or Numba) kernels do not pay off here. Pass
+# detailed=False when only the totals are needed.
+
+
+def calculate_hqla(assets: list[dict], detailed: bool = True) -> dict:
     """
     Calculate High-Quality Liquid Assets (HQLA) stock.
 
@@ -83,42 +108,46 @@ def calculate_hqla(assets: list[dict]) -> dict:
     -----------
     assets : list of dict
         Each should have: amount, asset_type (from HQLA_HAIRCUTS keys)
+    detailed : bool
+        If False, skip the per-asset breakdown ("assets" is left empty)
+        when only the level totals are needed
 
     Returns:
     --------
     dict
         HQLA calculation by level
     """
-    level1 = 0
-    level2a = 0
-    level2b = 0
+    totals = {"L1": 0, "L2A": 0, "L2B": 0}
 
     asset_details = []
 
+    # Table lookups bound once per call
+    haircut_for = HQLA_HAIRCUTS.get
+    level_for = HQLA_LEVELS.get
+
     for asset in assets:
         amount = asset.get("amount", 0)
         asset_type = asset.get("asset_type", "")
-        haircut = HQLA_HAIRCUTS.get(asset_type, 0.50)
+        haircut = haircut_for(asset_type, 0.50)
 
         adjusted_amount = amount * (1 - haircut)
 
-        if asset_type.startswith("L1"):
-            level1 += adjusted_amount
-            level = "L1"
-        elif asset_type.startswith("L2A"):
-            level2a += adjusted_amount
-            level = "L2A"
-        else:
-            level2b += adjusted_amount
-            level = "L2B"
-
-        asset_details.append({
-            "asset_type": asset_type,
-            "amount": amount,
-            "haircut": haircut,
-            "adjusted_amount": adjusted_amount,
-            "level": level,
-        })
+        # Unknown types are classified by prefix
+        level = level_for(asset_type) or _hqla_level(asset_type)
+        totals[level] += adjusted_amount
+
+        if detailed:
+            asset_details.append({
+                "asset_type": asset_type,
+                "amount": amount,
+                "haircut": haircut,
+                "adjusted_amount": adjusted_amount,
+                "level": level,
+            })
+
+    level1 = totals["L1"]
+    level2a = totals["L2A"]
+    level2b = totals["L2B"]
 
     # Apply caps
     # Level 2 cap: max 40% of total HQLA
@@ -145,7 +174,7 @@ def calculate_hqla(assets: list[dict]) -> dict:
     }
 
 
-def calculate_cash_outflows(liabilities: list[dict]) -> dict:
+def calculate_cash_outflows(liabilities: list[dict], detailed: bool = True) -> dict:
     """
     Calculate total expected cash outflows over 30 days.
 
@@ -153,6 +182,9 @@ def calculate_cash_outflows(liabilities: list[dict]) -> dict:
     -----------
     liabilities : list of dict
         Each should have: amount, liability_type (from CASH_OUTFLOW_RATES keys)
+    detailed : bool
+        If False, skip the per-item breakdown ("details" is left empty)
+        when only the total is needed
 
     Returns:
     --------
@@ -161,20 +193,22 @@ def calculate_cash_outflows(liabilities: list[dict]) -> dict:
     """
     total_outflows = 0
     outflow_details = []
+    rate_for = CASH_OUTFLOW_RATES.get  # bound once per call
 
     for liability in liabilities:
         amount = liability.get("amount", 0)
         liability_type = liability.get("liability_type", "")
-        rate = CASH_OUTFLOW_RATES.get(liability_type, 1.0)
+        rate = rate_for(liability_type, 1.0)
 
         outflow = amount * rate
 
-        outflow_details.append({
-            "liability_type": liability_type,
-            "amount": amount,
-            "outflow_rate": rate,
-            "outflow": outflow,
-        })
+        if detailed:
+            outflow_details.append({
+                "liability_type": liability_type,
+                "amount": amount,
+                "outflow_rate": rate,
+                "outflow": outflow,
+            })
 
         total_outflows += outflow
 
@@ -184,7 +218,11 @@ def calculate_cash_outflows(liabilities: list[dict]) -> dict:
     }
 
 
-def calculate_cash_inflows(receivables: list[dict], cap_rate: float = 0.75) -> dict:
+def calculate_cash_inflows(
+    receivables: list[dict],
+    cap_rate: float = 0.75,
+    detailed: bool = True
+) -> dict:
     """
     Calculate total expected cash inflows over 30 days.
 
@@ -196,6 +234,9 @@ def calculate_cash_inflows(receivables: list[dict], cap_rate: float = 0.75) -> d
         Each should have: amount, receivable_type
     cap_rate : float
         Maximum inflow as % of outflows (default 75%)
+    detailed : bool
+        If False, skip the per-item breakdown ("details" is left empty)
+        when only the total is needed
 
     Returns:
     --------
@@ -204,20 +245,22 @@ def calculate_cash_inflows(receivables: list[dict], cap_rate: float = 0.75) -> d
     """
     total_inflows = 0
     inflow_details = []
+    rate_for = CASH_INFLOW_RATES.get  # bound once per call
 
     for receivable in receivables:
         amount = receivable.get("amount", 0)
         receivable_type = receivable.get("receivable_type", "")
-        rate = CASH_INFLOW_RATES.get(receivable_type, 0.50)
+        rate = rate_for(receivable_type, 0.50)
 
         inflow = amount * rate
 
-        inflow_details.append({
-            "receivable_type": receivable_type,
-            "amount": amount,
-            "inflow_rate": rate,
-            "inflow": inflow,
-        })
+        if detailed:
+            inflow_details.append({
+                "receivable_type": receivable_type,
+                "amount": amount,
+                "inflow_rate": rate,
+                "inflow": inflow,
+            })
 
         total_inflows += inflow
 
@@ -232,7 +275,8 @@ def calculate_lcr(
     hqla_assets: list[dict],
     liabilities: list[dict],
     receivables: list[dict],
-    inflow_cap_rate: float = 0.75
+    inflow_cap_rate: float = 0.75,
+    detailed: bool = True
 ) -> dict:
     """
     Calculate Liquidity Coverage Ratio.
@@ -251,6 +295,9 @@ def calculate_lcr(
         Receivables for inflow calculation
     inflow_cap_rate : float
         Cap on inflows as % of outflows
+    detailed : bool
+        If False, skip the per-item breakdowns when only the ratio and
+        totals are needed ("assets" in hqla_breakdown is left empty)
 
     Returns:
     --------
@@ -258,38 +305,119 @@ def calculate_lcr(
         LCR calculation results
     """
     # Calculate components
-    hqla = calculate_hqla(hqla_assets)
-    outflows = calculate_cash_outflows(liabilities)
-    inflows = calculate_cash_inflows(receivables, inflow_cap_rate)
+    hqla = calculate_hqla(hqla_assets, detailed)
+    outflows = calculate_cash_outflows(liabilities, detailed)
+    inflows = calculate_cash_inflows(receivables, inflow_cap_rate, detailed)
+
+    total_hqla = hqla["total_hqla"]
+    gross_outflows = outflows["total_outflows"]
+    gross_inflows = inflows["total_inflows_gross"]
 
-    # Apply inflow cap
-    inflow_cap = outflows["total_outflows"] * inflow_cap_rate
-    capped_inflows = min(inflows["total_inflows_gross"], inflow_cap)
+    # Apply inflow cap (same result as min(gross_inflows, inflow_cap))
+    inflow_cap = gross_outflows * inflow_cap_rate
+    capped_inflows = inflow_cap if inflow_cap < gross_inflows else gross_inflows
 
     # Net cash outflows
-    net_outflows = outflows["total_outflows"] - capped_inflows
+    net_outflows = gross_outflows - capped_inflows
 
     # LCR
-    lcr = hqla["total_hqla"] / net_outflows if net_outflows > 0 else float('inf')
+    lcr = total_hqla / net_outflows if net_outflows > 0 else float('inf')
 
     # Check compliance
     is_compliant = lcr >= 1.0
 
     return {
-        "hqla": hqla["total_hqla"],
+        "hqla": total_hqla,
         "hqla_breakdown": hqla,
-        "gross_outflows": outflows["total_outflows"],
-        "gross_inflows": inflows["total_inflows_gross"],
+        "gross_outflows": gross_outflows,
+        "gross_inflows": gross_inflows,
         "capped_inflows": capped_inflows,
         "net_outflows": net_outflows,
         "lcr": lcr,
         "lcr_pct": lcr * 100,
         "minimum_requirement": 100,
         "is_compliant": is_compliant,
-        "surplus_deficit": hqla["total_hqla"] - net_outflows,
+        "surplus_deficit": total_hqla - net_outflows,
     }
 
 
+def _weighted_totals(amounts: list, rates) -> "np.ndarray":
+    """
+    Sum of amount × rate per scenario row of an (N_scenarios, N_items) rate
+    matrix, accumulated item by item in list order (the order the scalar
+    calculators sum in).
+    """
+    rates = np.asarray(rates, dtype=np.float64)
+    if rates.ndim != 2 or rates.shape[1] != len(amounts):
+        raise ValueError(
+            f"Rate matrix must have shape (n_scenarios, {len(amounts)}), got {rates.shape}"
+        )
+
+    totals = np.zeros(rates.shape[0])
+    for amount, item_rates in zip(amounts, np.ascontiguousarray(rates.T)):
+        totals += amount * item_rates
+    return totals
+
+
+def calculate_lcr_many(
+    hqla_assets: list[dict],
+    liabilities: list[dict],
+    receivables: list[dict],
+    outflow_rates,
+    inflow_rates=None,
+    inflow_cap_rate: float = 0.75
+) -> "np.ndarray":
+    """
+    Calculate the LCR under many outflow (and inflow) rate scenarios.
+
+    HQLA is computed once. Each scenario row gives a rate per liability
+    (and optionally per receivable), replacing the CASH_OUTFLOW_RATES /
+    CASH_INFLOW_RATES lookup; a row holding the table rates reproduces
+    calculate_lcr()["lcr"] exactly.
+
+    Parameters:
+    -----------
+    hqla_assets : list of dict
+        High-quality liquid assets
+    liabilities : list of dict
+        Liabilities and commitments, each with an amount
+    receivables : list of dict
+        Receivables for inflow calculation
+    outflow_rates : array-like
+        (n_scenarios, len(liabilities)) outflow rate per liability
+    inflow_rates : array-like, optional
+        (n_scenarios, len(receivables)) inflow rate per receivable. If
+        None, the CASH_INFLOW_RATES inflows apply to every scenario.
+    inflow_cap_rate : float
+        Cap on inflows as % of outflows
+
+    Returns:
+    --------
+    np.ndarray
+        LCR per scenario (inf where net outflows are not positive)
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy required for calculate_lcr_many: pip install numpy")
+
+    total_hqla = calculate_hqla(hqla_assets, detailed=False)["total_hqla"]
+
+    gross_outflows = _weighted_totals([l.get("amount", 0) for l in liabilities], outflow_rates)
+    if inflow_rates is None:
+        gross_inflows = calculate_cash_inflows(receivables, inflow_cap_rate, detailed=False)["total_inflows_gross"]
+    else:
+        gross_inflows = _weighted_totals([r.get("amount", 0) for r in receivables], inflow_rates)
+        if len(gross_inflows) != len(gross_outflows):
+            raise ValueError("outflow_rates and inflow_rates must have the same number of scenarios")
+
+    # Apply inflow cap, then LCR where net outflows are positive
+    capped_inflows = np.minimum(gross_inflows, gross_outflows * inflow_cap_rate)
+    net_outflows = gross_outflows - capped_inflows
+
+    lcr = np.full_like(net_outflows, np.inf)
+    np.divide(total_hqla, net_outflows, out=lcr, where=net_outflows > 0)
+    return lcr
+
+
 # =============================================================================
 # NSFR - Net Stable Funding Ratio (LIQ40)
 # =============================================================================
@@ -340,7 +468,7 @@ RSF_FACTORS = {
 }
 
 
-def calculate_asf(funding_sources: list[dict]) -> dict:
+def calculate_asf(funding_sources: list[dict], detailed: bool = True) -> dict:
     """
     Calculate Available Stable Funding.
 
@@ -348,6 +476,9 @@ def calculate_asf(funding_sources: list[dict]) -> dict:
     -----------
     funding_sources : list of dict
         Each should have: amount, funding_type (from ASF_FACTORS keys)
+    detailed : bool
+        If False, skip the per-item breakdown ("details" is left empty)
+        when only the total is needed
 
     Returns:
     --------
@@ -356,20 +487,22 @@ def calculate_asf(funding_sources: list[dict]) -> dict:
     """
     total_asf = 0
     asf_details = []
+    factor_for = ASF_FACTORS.get  # bound once per call
 
     for source in funding_sources:
         amount = source.get("amount", 0)
         funding_type = source.get("funding_type", "")
-        factor = ASF_FACTORS.get(funding_type, 0.0)
+        factor = factor_for(funding_type, 0.0)
 
         weighted_amount = amount * factor
 
-        asf_details.append({
-            "funding_type": funding_type,
-            "amount": amount,
-            "asf_factor": factor,
-            "weighted_amount": weighted_amount,
-        })
+        if detailed:
+            asf_details.append({
+                "funding_type": funding_type,
+                "amount": amount,
+                "asf_factor": factor,
+                "weighted_amount": weighted_amount,
+            })
 
         total_asf += weighted_amount
 
@@ -379,7 +512,11 @@ def calculate_asf(funding_sources: list[dict]) -> dict:
     }
 
 
-def calculate_rsf(assets: list[dict], off_balance_sheet: float = 0) -> dict:
+def calculate_rsf(
+    assets: list[dict],
+    off_balance_sheet: float = 0,
+    detailed: bool = True
+) -> dict:
     """
     Calculate Required Stable Funding.
 
@@ -389,6 +526,9 @@ def calculate_rsf(assets: list[dict], off_balance_sheet: float = 0) -> dict:
         Each should have: amount, asset_type (from RSF_FACTORS keys)
     off_balance_sheet : float
         Off-balance sheet exposures
+    detailed : bool
+        If False, skip the per-item breakdown ("details" is left empty)
+        when only the total is needed
 
     Returns:
     --------
@@ -397,20 +537,22 @@ def calculate_rsf(assets: list[dict], off_balance_sheet: float = 0) -> dict:
     """
     total_rsf = 0
     rsf_details = []
+    factor_for = RSF_FACTORS.get  # bound once per call
 
     for asset in assets:
         amount = asset.get("amount", 0)
         asset_type = asset.get("asset_type", "")
-        factor = RSF_FACTORS.get(asset_type, 1.0)
+        factor = factor_for(asset_type, 1.0)
 
         weighted_amount = amount * factor
 
-        rsf_details.append({
-            "asset_type": asset_type,
-            "amount": amount,
-            "rsf_factor": factor,
-            "weighted_amount": weighted_amount,
-        })
+        if detailed:
+            rsf_details.append({
+                "asset_type": asset_type,
+                "amount": amount,
+                "rsf_factor": factor,
+                "weighted_amount": weighted_amount,
+            })
 
         total_rsf += weighted_amount
 
@@ -418,12 +560,13 @@ def calculate_rsf(assets: list[dict], off_balance_sheet: float = 0) -> dict:
     obs_rsf = off_balance_sheet * RSF_FACTORS["off_balance_sheet"]
     total_rsf += obs_rsf
 
-    rsf_details.append({
-        "asset_type": "off_balance_sheet",
-        "amount": off_balance_sheet,
-        "rsf_factor": RSF_FACTORS["off_balance_sheet"],
-        "weighted_amount": obs_rsf,
-    })
+    if detailed:
+        rsf_details.append({
+            "asset_type": "off_balance_sheet",
+            "amount": off_balance_sheet,
+            "rsf_factor": RSF_FACTORS["off_balance_sheet"],
+            "weighted_amount": obs_rsf,
+        })
 
     return {
         "total_rsf": total_rsf,
@@ -434,7 +577,8 @@ def calculate_rsf(assets: list[dict], off_balance_sheet: float = 0) -> dict:
 def calculate_nsfr(
     funding_sources: list[dict],
     assets: list[dict],
-    off_balance_sheet: float = 0
+    off_balance_sheet: float = 0,
+    detailed: bool = True
 ) -> dict:
     """
     Calculate Net Stable Funding Ratio.
@@ -451,14 +595,17 @@ def calculate_nsfr(
         Assets for RSF
     off_balance_sheet : float
         Off-balance sheet exposures
+    detailed : bool
+        If False, skip the per-item breakdowns when only the ratio and
+        totals are needed ("details" in the ASF/RSF breakdowns is left empty)
 
     Returns:
     --------
     dict
         NSFR calculation results
     """
-    asf = calculate_asf(funding_sources)
-    rsf = calculate_rsf(assets, off_balance_sheet)
+    asf = calculate_asf(funding_sources, detailed)
+    rsf = calculate_rsf(assets, off_balance_sheet, detailed)
 
     nsfr = asf["total_asf"] / rsf["total_rsf"] if rsf["total_rsf"] > 0 else float('inf')
 
@@ -477,6 +624,67 @@ def calculate_nsfr(
     }
 
 
+def calculate_nsfr_many(
+    funding_sources: list[dict],
+    assets: list[dict],
+    asf_factors=None,
+    rsf_factors=None,
+    off_balance_sheet: float = 0
+) -> "np.ndarray":
+    """
+    Calculate the NSFR under many ASF and/or RSF factor scenarios.
+
+    Each scenario row gives a factor per funding source (and/or per
+    asset), replacing the ASF_FACTORS / RSF_FACTORS lookup; the side
+    without a matrix uses the table factors in every scenario. A row
+    holding the table factors reproduces calculate_nsfr()["nsfr"] exactly.
+
+    Parameters:
+    -----------
+    funding_sources : list of dict
+        Liabilities and capital for ASF, each with an amount
+    assets : list of dict
+        Assets for RSF, each with an amount
+    asf_factors : array-like, optional
+        (n_scenarios, len(funding_sources)) ASF factor per funding source
+    rsf_factors : array-like, optional
+        (n_scenarios, len(assets)) RSF factor per asset
+    off_balance_sheet : float
+        Off-balance sheet exposures (table RSF factor in every scenario)
+
+    Returns:
+    --------
+    np.ndarray
+        NSFR per scenario (inf where RSF is not positive)
+    """
+    if not HAS_NUMPY:
+        raise ImportError("NumPy required for calculate_nsfr_many: pip install numpy")
+    if asf_factors is None and rsf_factors is None:
+        raise ValueError("Provide asf_factors and/or rsf_factors scenarios")
+
+    if asf_factors is None:
+        total_asf = calculate_asf(funding_sources, detailed=False)["total_asf"]
+    else:
+        total_asf = _weighted_totals([f.get("amount", 0) for f in funding_sources], asf_factors)
+
+    if rsf_factors is None:
+        total_rsf = calculate_rsf(assets, off_balance_sheet, detailed=False)["total_rsf"]
+    else:
+        total_rsf = _weighted_totals([a.get("amount", 0) for a in assets], rsf_factors)
+        total_rsf += off_balance_sheet * RSF_FACTORS["off_balance_sheet"]
+        if asf_factors is not None and len(total_rsf) != len(total_asf):
+            raise ValueError("asf_factors and rsf_factors must have the same number of scenarios")
+
+    total_asf, total_rsf = np.broadcast_arrays(
+        np.asarray(total_asf, dtype=np.float64), np.asarray(total_rsf, dtype=np.float64)
+    )
+
+    # Ratio where RSF is positive, inf elsewhere (as in calculate_nsfr)
+    nsfr = np.full(total_rsf.shape, np.inf)
+    np.divide(total_asf, total_rsf, out=nsfr, where=total_rsf > 0)
+    return nsfr
+
+
 # Example usage
 if __name__ == "__main__":
     print("=" * 70)
@@ -508,9 +716,10 @@ if __name__ == "__main__":
     lcr_result = calculate_lcr(hqla_assets, liabilities, receivables)
 
     print(f"\n  HQLA:                    ${lcr_result['hqla']:,.0f}")
-    print(f"    Level 1:               ${lcr_result['hqla_breakdown']['level1']:,.0f}")
-    print(f"    Level 2A:              ${lcr_result['hqla_breakdown']['level2a_adjusted']:,.0f}")
-    print(f"    Level 2B:              ${lcr_result['hqla_breakdown']['level2b_adjusted']:,.0f}")
+    hqla_breakdown = lcr_result['hqla_breakdown']
+    print(f"    Level 1:               ${hqla_breakdown['level1']:,.0f}")
+    print(f"    Level 2A:              ${hqla_breakdown['level2a_adjusted']:,.0f}")
+    print(f"    Level 2B:              ${hqla_breakdown['level2b_adjusted']:,.0f}")
     print(f"  Gross Outflows:          ${lcr_result['gross_outflows']:,.0f}")
     print(f"  Capped Inflows:          ${lcr_result['capped_inflows']:,.0f}")
     print(f"  Net Outflows:            ${lcr_result['net_outflows']:,.0f}")
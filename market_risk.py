@@ -10,6 +10,12 @@ Implements:
 import math
 from typing import Optional
 
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 
 # =============================================================================
 # FRTB Risk Weights and Correlations (MAR21)
@@ -147,7 +153,7 @@ def calculate_curvature_sensitivity(
 
 
 def aggregate_sensitivities_within_bucket(
-    sensitivities: list[float],
+    sensitivities,
     correlation: float = 0.50
 ) -> float:
     """
@@ -155,9 +161,21 @@ def aggregate_sensitivities_within_bucket(
 
     K_b = sqrt(sum(s_i^2) + 2 * rho * sum_{i<j}(s_i * s_j))
         = sqrt(sum(s_i^2) + rho * ((sum(s_i))^2 - sum(s_i^2)))
+
+    ``sensitivities`` may be a list of floats or a 1-D numeric NumPy
+    array (other shapes raise ValueError). Arrays are reduced with
+    ``arr.sum()`` and ``arr @ arr`` instead of iterating element by
+    element; those reductions are pairwise/BLAS, so the result can differ
+    from the list path in the last bits.
     """
-    sum_s = sum(sensitivities)
-    sum_s_sq = sum(s**2 for s in sensitivities)
+    if HAS_NUMPY and isinstance(sensitivities, np.ndarray):
+        if sensitivities.ndim != 1:
+            raise ValueError(f"sensitivities array must be 1-D, got shape {sensitivities.shape}")
+        sum_s = float(sensitivities.sum())
+        sum_s_sq = float(sensitivities @ sensitivities)
+    else:
+        sum_s = sum(sensitivities)
+        sum_s_sq = sum(s**2 for s in sensitivities)
 
     k_b = math.sqrt(max(sum_s_sq + correlation * (sum_s**2 - sum_s_sq), 0))
     return k_b
@@ -172,16 +190,20 @@ def aggregate_across_buckets(
     Aggregate across buckets.
 
     K = sqrt(sum(K_b^2) + 2 * sum_{b<c}(gamma_{bc} * S_b * S_c))
+      = sqrt(sum(K_b^2) + gamma * ((sum(S_b))^2 - sum(S_b^2)))
+
+    With a single gamma the pairwise cross term has the same closed form
+    as the within-bucket aggregation, so this is O(B) rather than O(B^2).
     """
-    buckets = list(bucket_capitals.keys())
     sum_k_sq = sum(k**2 for k in bucket_capitals.values())
 
-    cross_term = 0
-    for i, b1 in enumerate(buckets):
-        for b2 in buckets[i+1:]:
-            s_b = bucket_sensitivities.get(b1, 0)
-            s_c = bucket_sensitivities.get(b2, 0)
-            cross_term += inter_bucket_correlation * s_b * s_c
+    sum_s = 0
+    sum_s_sq = 0
+    for bucket in bucket_capitals:
+        s_b = bucket_sensitivities.get(bucket, 0)
+        sum_s += s_b
+        sum_s_sq += s_b**2
+    cross_term = inter_bucket_correlation * (sum_s**2 - sum_s_sq) / 2
 
     k_total = math.sqrt(max(sum_k_sq + 2 * cross_term, 0))
     return k_total
@@ -224,30 +246,26 @@ def calculate_delta_capital(
         intra_corr = CORRELATIONS["COM_same_bucket"]
         inter_corr = CORRELATIONS["COM_different_bucket"]
 
-    # Group positions by bucket
+    # Group weighted sensitivities by bucket. Only the weighted value is
+    # used downstream, so keep a flat list of floats per bucket rather than
+    # a dict per position.
     buckets = {}
     for pos in positions:
         bucket = pos.get("bucket", "default")
-        if bucket not in buckets:
-            buckets[bucket] = []
+        weighted = buckets.get(bucket)
+        if weighted is None:
+            weighted = buckets[bucket] = []
 
         # Calculate weighted sensitivity
         sensitivity = pos.get("sensitivity", 0)
         rw = pos.get("risk_weight", 1.0) / 100  # Convert from %
-        weighted_sens = sensitivity * rw
-
-        buckets[bucket].append({
-            "sensitivity": sensitivity,
-            "risk_weight": rw,
-            "weighted_sensitivity": weighted_sens,
-        })
+        weighted.append(sensitivity * rw)
 
     # Calculate bucket-level capital
     bucket_capitals = {}
     bucket_net_sens = {}
 
-    for bucket, positions_in_bucket in buckets.items():
-        weighted_sens = [p["weighted_sensitivity"] for p in positions_in_bucket]
+    for bucket, weighted_sens in buckets.items():
         k_b = aggregate_sensitivities_within_bucket(weighted_sens, intra_corr)
         bucket_capitals[bucket] = k_b
         bucket_net_sens[bucket] = sum(weighted_sens)
@@ -578,6 +596,12 @@ def calculate_frtb_sa(
 
     Where K_SbM = sum of all risk class capitals
 
+    Nothing is cached between calls: hashing the position lists costs
+    more than the calculation itself. When re-running with only some
+    risk classes changed (e.g. what-if or attribution runs), reuse the
+    unchanged entries of ``sbm_results`` from an earlier result or call
+    calculate_sbm_capital() for the changed class only.
+
     Parameters:
     -----------
     delta_positions : dict